@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Batch Joke Runner
+Streams a JSONL file of {topic, style, model} requests, generates jokes and
+limericks concurrently, and writes results to a JSONL file in input order.
+Progress is checkpointed so an interrupted run resumes where it left off.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, Optional, Tuple
+
+from enhanced_limerick_generator import EnhancedLimerickGenerator
+
+
+def read_requests(path: str) -> Iterator[Tuple[int, str]]:
+    """Yield (index, raw line) for each non-blank line of a JSONL file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        index = 0
+        for line in f:
+            if line.strip():
+                yield index, line
+                index += 1
+
+
+def count_requests(path: str) -> int:
+    """Count the requests in a JSONL file without loading it."""
+    return sum(1 for _ in read_requests(path))
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as e.g. '1h02m', '4m18s' or '12s'."""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class BatchRunner:
+    def __init__(self, output_path: str, concurrency: int = 4, max_in_flight: Optional[int] = None,
+                 joke_generator=None, limerick_generator: Optional[EnhancedLimerickGenerator] = None,
+                 progress_interval: float = 5.0):
+        """Initialize the batch runner.
+
+        Results are appended to ``output_path`` strictly in input order. Results
+        that finish ahead of their turn are journaled to ``<output>.partial`` so
+        they aren't paid for again after a crash.
+        """
+        self.output_path = output_path
+        self.checkpoint_path = output_path + '.partial'
+        self.concurrency = concurrency
+        self.max_in_flight = max_in_flight or concurrency * 2
+        self.joke_generator = joke_generator
+        self.limerick_generator = limerick_generator or EnhancedLimerickGenerator()
+        self.progress_interval = progress_interval
+        self._generator_lock = threading.Lock()
+
+    def run(self, input_path: str) -> int:
+        """Process every request in the input file. Returns the number processed this run."""
+        total = count_requests(input_path)
+        done = self._recover_output()
+        pending_results = self._load_checkpoint(done)
+        if done or pending_results:
+            print(f"🔁 Resuming: {done} written, {len(pending_results)} checkpointed, {total} total",
+                  file=sys.stderr)
+
+        next_to_write = done
+        processed = 0
+        started = time.monotonic()
+        last_report = started
+        in_flight = {}
+
+        with open(self.output_path, 'a', encoding='utf-8') as output, \
+                open(self.checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+                ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            requests = read_requests(input_path)
+            exhausted = False
+            held = None
+
+            while True:
+                # Flush any checkpointed results that are now next in line
+                while next_to_write in pending_results:
+                    self._write_line(output, pending_results.pop(next_to_write))
+                    next_to_write += 1
+
+                # Keep the pipeline full without reading the whole file
+                while not exhausted and len(in_flight) < self.max_in_flight:
+                    item, held = held or next(requests, None), None
+                    if item is None:
+                        exhausted = True
+                        break
+                    index, line = item
+                    if index < next_to_write or index in pending_results:
+                        continue
+                    if index - next_to_write >= self.max_in_flight:
+                        # Don't run further ahead of a slow request than the
+                        # in-flight bound, so buffered results stay bounded too
+                        held = item
+                        break
+                    in_flight[executor.submit(self._process, index, line)] = index
+
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, timeout=self.progress_interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = in_flight.pop(future)
+                    result = future.result()
+                    processed += 1
+                    if index == next_to_write:
+                        self._write_line(output, result)
+                        next_to_write += 1
+                    else:
+                        self._write_line(checkpoint, result)
+                        pending_results[index] = result
+
+                now = time.monotonic()
+                if now - last_report >= self.progress_interval:
+                    self._report_progress(next_to_write + len(pending_results), total, processed, now - started)
+                    last_report = now
+
+        self._report_progress(next_to_write, total, processed, time.monotonic() - started)
+        if next_to_write >= total:
+            os.remove(self.checkpoint_path)
+        return processed
+
+    def _process(self, index: int, line: str) -> Dict:
+        """Run a single request line and build its result record."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return {'index': index, 'ok': False, 'result': f"❌ Invalid JSON: {str(e)}"}
+        if not isinstance(request, dict):
+            return {'index': index, 'ok': False, 'result': "❌ Request must be a JSON object."}
+
+        topic = str(request.get('topic') or '').strip()
+        kind = request.get('kind', 'joke')
+        style = request.get('style', 'witty')
+        model = request.get('model')
+        record = {'index': index, 'topic': topic, 'kind': kind, 'style': style, 'model': model}
+
+        try:
+            if not topic:
+                result = "❌ Missing topic."
+            elif kind == 'limerick':
+                with self._generator_lock:
+                    result = self.limerick_generator.generate_limerick(topic)
+            elif kind == 'joke':
+                result = self._get_joke_generator().generate_joke(topic, style, model)
+            else:
+                result = f"❌ Unknown request kind: {kind}"
+        except Exception as e:
+            # One bad request must not abort the whole batch
+            result = f"❌ Unexpected error: {str(e)}"
+
+        record['ok'] = not result.startswith('❌')
+        record['result'] = result
+        return record
+
+    def _get_joke_generator(self):
+        """Create the Bedrock joke generator on first use."""
+        with self._generator_lock:
+            if self.joke_generator is None:
+                from joke_generator import BedrockJokeGenerator
+                self.joke_generator = BedrockJokeGenerator()
+            return self.joke_generator
+
+    def _recover_output(self, chunk_size: int = 1 << 20) -> int:
+        """Count complete lines already in the output, dropping a torn last line."""
+        return self._drop_torn_line(self.output_path, chunk_size)
+    
+    def _drop_torn_line(self, path: str, chunk_size: int = 1 << 20) -> int:
+        """Truncate a file after its last newline so appends start on a fresh line.
+
+        Returns the number of complete lines left in the file.
+        """
+        if not os.path.exists(path):
+            return 0
+        lines = 0
+        complete = 0
+        position = 0
+        with open(path, 'rb+') as f:
+            # Scan in chunks so large outputs are never loaded whole
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                newlines = chunk.count(b'\n')
+                if newlines:
+                    lines += newlines
+                    complete = position + chunk.rfind(b'\n') + 1
+                position += len(chunk)
+            if complete < position:
+                f.truncate(complete)
+        return lines
+
+    def _load_checkpoint(self, done: int) -> Dict[int, Dict]:
+        """Load out-of-order results journaled by a previous run."""
+        results = {}
+        if not os.path.exists(self.checkpoint_path):
+            return results
+        # A torn write from a crash would otherwise glue onto the next append;
+        # that request will simply be rerun
+        self._drop_torn_line(self.checkpoint_path)
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record['index'] >= done:
+                    results[record['index']] = record
+        return results
+
+    def _write_line(self, f, record: Dict):
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        f.flush()
+
+    def _report_progress(self, completed: int, total: int, processed: int, elapsed: float):
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(total - completed, 0)
+        eta = format_duration(remaining / rate) if rate else '?'
+        percent = 100.0 * completed / total if total else 100.0
+        print(f"⏳ {completed}/{total} ({percent:.1f}%) · {rate:.1f} req/s · ETA {eta}", file=sys.stderr)
+
+
+def main():
+    """Run a batch of joke and limerick requests from the command line."""
+    parser = argparse.ArgumentParser(description="Generate jokes and limericks from a JSONL file of requests.")
+    parser.add_argument('input', nargs='?', default='requests.jsonl', help="input JSONL file (default: requests.jsonl)")
+    parser.add_argument('-o', '--output', default='results.jsonl', help="output JSONL file (default: results.jsonl)")
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help="number of concurrent requests")
+    parser.add_argument('--max-in-flight', type=int, help="max requests queued or running (default: 2x concurrency)")
+    parser.add_argument('--regions', help="comma-separated AWS regions to spread joke requests across")
+    parser.add_argument('--latency-budget', type=float, help="seconds before falling back to local jokes")
+    args = parser.parse_args()
+
+    joke_generator = None
+    if args.regions or args.latency_budget is not None:
+        from joke_generator import BedrockJokeGenerator
+        regions = args.regions.split(',') if args.regions else None
+        joke_generator = BedrockJokeGenerator(regions=regions, latency_budget=args.latency_budget)
+
+    runner = BatchRunner(args.output, concurrency=args.concurrency, max_in_flight=args.max_in_flight,
+                         joke_generator=joke_generator)
+    processed = runner.run(args.input)
+    print(f"🎉 Done! Processed {processed} requests → {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
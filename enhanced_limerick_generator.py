@@ -6,7 +6,19 @@ A more sophisticated Python app that creates humorous limericks with better rhym
 
 import random
 import re
-from typing import List, Dict, Tuple
+import struct
+import sys
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+# First recorded choice of a limerick built by _build_simple_limerick
+SIMPLE_TEMPLATE_ID = 255
+
+# Middle line set referenced by a template, e.g. 'a' for {line3_a}
+_MIDDLE_LINE_KEY = re.compile(r'\{line3_(\w+)\}')
+
+# LimerickBuffer.to_bytes() header: topic count, record count, data size
+BUFFER_HEADER = '<QQQ'
 
 class EnhancedLimerickGenerator:
     def __init__(self):
@@ -106,42 +118,72 @@ class EnhancedLimerickGenerator:
             'f': ["They'd {verb} every {noun}", "Each {noun} they would {verb}", "Their {verb} made people {verb2}", "When they'd {verb}, crowds would {verb2}"]
         }
 
-    def generate_limerick(self, topic: str) -> str:
-        """Generate a unique limerick based on the given topic."""
+    def generate_limerick(self, topic: str, compact: bool = False) -> Union[str, 'CompactLimerick']:
+        """Generate a unique limerick based on the given topic.
+
+        With ``compact=True`` a CompactLimerick is returned instead of text; it
+        stores only the choices made and renders the same limerick on demand.
+        """
         topic = topic.strip().lower()
+        # Get topic-specific words or use defaults
+        topic_data = self._get_topic_data(topic)
         
         # Try multiple times to get a unique combination
         for attempt in range(5):
-            # Get topic-specific words or use defaults
-            topic_data = self.topic_words.get(topic, self._get_default_words(topic))
+            recorder = _ChoiceRecorder()
+            choose = recorder if compact else random.choice
             
             # Choose random template and rhyme sets
-            template = random.choice(self.templates)
-            rhyme_set = random.choice(self.rhyme_sets['place_rhymes'])
-            action_rhymes = random.choice(self.rhyme_sets['action_rhymes'])
-            name_rhymes = random.choice(self.rhyme_sets['name_rhymes'])
+            template, rhyme_set, action_rhymes, name_rhymes = self._choose_combination(choose)
             
             # Create combination signature to check uniqueness
             combination = (template, tuple(rhyme_set), tuple(action_rhymes))
             
             if combination not in self.recent_combinations:
                 # Build the limerick with new template system
-                limerick = self._build_new_limerick(template, topic_data, rhyme_set, action_rhymes, name_rhymes)
+                limerick = self._build_new_limerick(template, topic_data, rhyme_set, action_rhymes, name_rhymes, choose)
                 
                 # Track this combination
                 self.recent_combinations.append(combination)
                 if len(self.recent_combinations) > self.max_recent:
                     self.recent_combinations.pop(0)
                 
-                return limerick
+                return CompactLimerick(self, topic, recorder.ids) if compact else limerick
         
         # Fallback if we can't find unique combination
-        return self._build_simple_limerick(topic_data)
+        if not compact:
+            return self._build_simple_limerick(topic_data)
+        recorder = _ChoiceRecorder(SIMPLE_TEMPLATE_ID)
+        self._build_simple_limerick(topic_data, recorder)
+        return CompactLimerick(self, topic, recorder.ids)
+    
+    def render_limerick(self, topic: str, ids: bytes) -> str:
+        """Render a limerick from the choices recorded by generate_limerick(compact=True)."""
+        topic_data = self._get_topic_data(topic)
+        if ids[0] == SIMPLE_TEMPLATE_ID:
+            return self._build_simple_limerick(topic_data, _ChoiceReplayer(ids[1:]))
+        
+        choose = _ChoiceReplayer(ids)
+        template, rhyme_set, action_rhymes, name_rhymes = self._choose_combination(choose)
+        return self._build_new_limerick(template, topic_data, rhyme_set, action_rhymes, name_rhymes, choose)
     
     def get_random_topic_suggestion(self) -> str:
         """Get a random topic suggestion for the user."""
         return random.choice(self.topic_suggestions)
     
+    def _get_topic_data(self, topic: str) -> Dict[str, List[str]]:
+        """Get the word bank for a (normalized) topic."""
+        return self.topic_words.get(topic) or self._get_default_words(topic)
+    
+    def _choose_combination(self, choose: Callable) -> Tuple[str, List[str], List[str], List[str]]:
+        """Choose a template and the rhyme sets to fill it with."""
+        return (
+            choose(self.templates),
+            choose(self.rhyme_sets['place_rhymes']),
+            choose(self.rhyme_sets['action_rhymes']),
+            choose(self.rhyme_sets['name_rhymes'])
+        )
+    
     def _get_default_words(self, topic: str) -> Dict[str, List[str]]:
         """Generate default words for unknown topics."""
         return {
@@ -153,48 +195,49 @@ class EnhancedLimerickGenerator:
     
 
     
-    def _build_new_limerick(self, template: str, topic_data: Dict, rhyme_set: List[str], action_rhymes: List[str], name_rhymes: List[str]) -> str:
+    def _build_new_limerick(self, template: str, topic_data: Dict, rhyme_set: List[str], action_rhymes: List[str], name_rhymes: List[str], choose: Callable = random.choice) -> str:
         """Build limerick using new template system."""
         # Select words for the limerick
         words = {
-            'adj1': random.choice(topic_data['adjectives']),
-            'adj2': random.choice(['clever', 'amazing', 'wonderful', 'peculiar', 'remarkable']),
-            'noun1': random.choice(topic_data['nouns']),
-            'noun2': random.choice(['grace', 'style', 'flair', 'skill', 'charm', 'wit', 'pace']),
-            'verb1': random.choice(topic_data['verbs']),
-            'verb2': random.choice(['laugh', 'cheer', 'stare', 'smile', 'gasp']),
+            'adj1': choose(topic_data['adjectives']),
+            'adj2': choose(['clever', 'amazing', 'wonderful', 'peculiar', 'remarkable']),
+            'noun1': choose(topic_data['nouns']),
+            'noun2': choose(['grace', 'style', 'flair', 'skill', 'charm', 'wit', 'pace']),
+            'verb1': choose(topic_data['verbs']),
+            'verb2': choose(['laugh', 'cheer', 'stare', 'smile', 'gasp']),
             'place1': rhyme_set[0],
             'place2': rhyme_set[1],
             'name1': name_rhymes[0],
             'name2': name_rhymes[1],
             'end1': action_rhymes[0],
             'end2': action_rhymes[1],
-            'rhyme_ew': random.choice(self.rhyme_sets['ew_rhymes']),
-            'conclusion1': random.choice(self.line_parts['conclusions'])
+            'rhyme_ew': choose(self.rhyme_sets['ew_rhymes']),
+            'conclusion1': choose(self.line_parts['conclusions'])
         }
         
-        # Add dynamic middle lines
-        for key, templates in self.middle_lines.items():
-            words[f'line3_{key}'] = random.choice(templates).format(
-                verb=random.choice(topic_data['verbs']), 
-                verb2=random.choice(['dance', 'prance', 'bounce', 'leap']),
-                noun=random.choice(['joy', 'pride', 'glee', 'delight']),
-                adj=random.choice(['grand', 'fine', 'bold', 'bright'])
+        # Add dynamic middle lines, only for the set this template uses
+        for key in _MIDDLE_LINE_KEY.findall(template):
+            templates = self.middle_lines[key]
+            words[f'line3_{key}'] = choose(templates).format(
+                verb=choose(topic_data['verbs']), 
+                verb2=choose(['dance', 'prance', 'bounce', 'leap']),
+                noun=choose(['joy', 'pride', 'glee', 'delight']),
+                adj=choose(['grand', 'fine', 'bold', 'bright'])
             )
-            words[f'line4_{key}'] = random.choice(templates).format(
-                verb=random.choice(topic_data['verbs']),
-                verb2=random.choice(['cheer', 'clap', 'watch', 'marvel']),
-                noun=random.choice(['fame', 'praise', 'awe', 'wonder']),
-                adj=random.choice(['proud', 'glad', 'wise', 'keen'])
+            words[f'line4_{key}'] = choose(templates).format(
+                verb=choose(topic_data['verbs']),
+                verb2=choose(['cheer', 'clap', 'watch', 'marvel']),
+                noun=choose(['fame', 'praise', 'awe', 'wonder']),
+                adj=choose(['proud', 'glad', 'wise', 'keen'])
             )
         
         return template.format(**words)
     
-    def _build_simple_limerick(self, topic_data: Dict) -> str:
+    def _build_simple_limerick(self, topic_data: Dict, choose: Callable = random.choice) -> str:
         """Fallback simple limerick builder."""
-        adj = random.choice(topic_data['adjectives'])
-        noun = random.choice(topic_data['nouns'])
-        verb = random.choice(topic_data['verbs'])
+        adj = choose(topic_data['adjectives'])
+        noun = choose(topic_data['nouns'])
+        verb = choose(topic_data['verbs'])
         
         return f"""There once was a {adj} {noun} so bright,
 Who {verb} from morning till night,
@@ -202,6 +245,148 @@ They'd dance and they'd play,
 In their own special way,
 What a truly delightful sight!"""
 
+class _ChoiceRecorder:
+    """Drop-in for random.choice that records the index of every pick."""
+    
+    def __init__(self, *prefix: int):
+        self.ids = bytearray(prefix)
+    
+    def __call__(self, options: Sequence):
+        index = random.randrange(len(options))
+        self.ids.append(index)
+        return options[index]
+
+class _ChoiceReplayer:
+    """Drop-in for random.choice that replays previously recorded picks."""
+    
+    def __init__(self, ids: Iterable[int]):
+        self._ids: Iterator[int] = iter(ids)
+    
+    def __call__(self, options: Sequence):
+        return options[next(self._ids)]
+
+class CompactLimerick:
+    """A limerick stored as the ids of its choices into the generator's word banks.
+    
+    Rendering depends on the generator's word banks, so they must not change
+    between generating a record and rendering it.
+    """
+    __slots__ = ('generator', 'topic', 'ids')
+    
+    def __init__(self, generator: EnhancedLimerickGenerator, topic: str, ids: bytes):
+        self.generator = generator
+        self.topic = sys.intern(topic)
+        self.ids = bytes(ids)
+    
+    def render(self) -> str:
+        """Render the limerick text."""
+        return self.generator.render_limerick(self.topic, self.ids)
+    
+    def __str__(self) -> str:
+        return self.render()
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactLimerick):
+            return NotImplemented
+        return self.topic == other.topic and self.ids == other.ids
+    
+    def __hash__(self) -> int:
+        return hash((self.topic, self.ids))
+
+class LimerickBuffer:
+    """Many compact limericks packed into a few flat arrays."""
+    
+    def __init__(self, generator: EnhancedLimerickGenerator):
+        self.generator = generator
+        self.topics: List[str] = []
+        self._topic_index: Dict[str, int] = {}
+        self.topic_ids = array('I')
+        # Record i is data[offsets[i]:offsets[i + 1]]
+        self.offsets = array('Q', [0])
+        self.data = bytearray()
+    
+    def __len__(self) -> int:
+        return len(self.topic_ids)
+    
+    def __getitem__(self, index: int) -> CompactLimerick:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("limerick index out of range")
+        ids = self.data[self.offsets[index]:self.offsets[index + 1]]
+        return CompactLimerick(self.generator, self.topics[self.topic_ids[index]], ids)
+    
+    def __iter__(self) -> Iterator[CompactLimerick]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    def append(self, limerick: CompactLimerick):
+        """Add a compact limerick to the buffer."""
+        topic_id = self._topic_index.get(limerick.topic)
+        if topic_id is None:
+            topic_id = self._topic_index[limerick.topic] = len(self.topics)
+            self.topics.append(limerick.topic)
+        self.topic_ids.append(topic_id)
+        self.data += limerick.ids
+        self.offsets.append(len(self.data))
+    
+    def extend(self, limericks: Iterable[CompactLimerick]):
+        """Add several compact limericks to the buffer."""
+        for limerick in limericks:
+            self.append(limerick)
+    
+    def to_bytes(self) -> bytes:
+        """Serialize the buffer for storage (little-endian, fixed item sizes)."""
+        encoded_topics = [topic.encode('utf-8') for topic in self.topics]
+        topic_offsets = array('Q', [0])
+        for topic in encoded_topics:
+            topic_offsets.append(topic_offsets[-1] + len(topic))
+        
+        header = struct.pack(BUFFER_HEADER, len(self.topics), len(self), len(self.data))
+        return b''.join([
+            header,
+            _pack_little_endian(topic_offsets),
+            b''.join(encoded_topics),
+            _pack_little_endian(self.topic_ids),
+            _pack_little_endian(self.offsets),
+            bytes(self.data)
+        ])
+    
+    @classmethod
+    def from_bytes(cls, generator: EnhancedLimerickGenerator, blob: bytes) -> 'LimerickBuffer':
+        """Load a buffer written by to_bytes()."""
+        topic_count, count, data_size = struct.unpack_from(BUFFER_HEADER, blob)
+        position = struct.calcsize(BUFFER_HEADER)
+        
+        topic_offsets, position = _unpack_little_endian('Q', blob, position, topic_count + 1)
+        topic_bytes = blob[position:position + topic_offsets[-1]]
+        position += topic_offsets[-1]
+        
+        buffer = cls(generator)
+        buffer.topics = [topic_bytes[start:end].decode('utf-8')
+                         for start, end in zip(topic_offsets, topic_offsets[1:])]
+        buffer._topic_index = {topic: i for i, topic in enumerate(buffer.topics)}
+        buffer.topic_ids, position = _unpack_little_endian('I', blob, position, count)
+        buffer.offsets, position = _unpack_little_endian('Q', blob, position, count + 1)
+        buffer.data = bytearray(blob[position:position + data_size])
+        return buffer
+
+def _pack_little_endian(values: array) -> bytes:
+    """Serialize an array in little-endian byte order."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _unpack_little_endian(typecode: str, blob: bytes, position: int, count: int) -> Tuple[array, int]:
+    """Read ``count`` little-endian items at ``position``; returns the array and the new position."""
+    values = array(typecode)
+    end = position + count * values.itemsize
+    values.frombytes(blob[position:end])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values, end
+
 def main():
     """Main function with enhanced interface."""
     generator = EnhancedLimerickGenerator()
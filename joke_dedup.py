@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Joke Index
+Detects jokes that repeat an earlier pun with slightly different wording,
+using MinHash signatures and LSH banding for fast lookup.
+"""
+
+import hashlib
+import re
+import struct
+import sys
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+FILE_MAGIC = b'JKMH0002'
+FILE_HEADER = struct.Struct('<dHHQQQ')
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+# Fibonacci hashing multiplier for spreading band keys over table slots
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+# Filler words that would make unrelated jokes look similar
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'because', 'but', 'did', 'do', 'does',
+    'for', 'had', 'has', 'have', 'he', 'her', 'his', 'i', 'in', 'is', 'it', "it's",
+    'just', 'my', 'of', 'on', 'or', 'she', 'so', 'that', 'the', 'their', 'they',
+    'this', 'to', 'was', 'what', 'when', 'who', 'why', 'with', 'you', 'your'
+}
+
+
+def _little_endian(values: array) -> array:
+    """Return a copy of an array in little-endian byte order."""
+    values = array(values.typecode, values)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: float = 0.6, num_bands: int = 8, rows_per_band: int = 3,
+                 seed: int = 1, capacity: int = 1024):
+        """Initialize an empty index.
+
+        Jokes whose word sets have an estimated Jaccard similarity of at least
+        ``threshold`` are treated as near-duplicates. Candidates are found via
+        ``num_bands`` LSH bands of ``rows_per_band`` MinHash values each.
+
+        Storage is flat: 16-bit MinHash values (``2 * num_bands * rows_per_band``
+        bytes per joke) plus one open-addressed table of joke ids per band. The
+        tables double when half full, which rehashes every joke, so pass the
+        expected number of jokes as ``capacity`` when building large indexes.
+        """
+        self.threshold = threshold
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+        self.seed = seed
+        self.num_hashes = num_bands * rows_per_band
+
+        # Flat store of signatures: joke i occupies [i * num_hashes, (i + 1) * num_hashes)
+        self.signatures = array('H')
+        # One table per band; a slot holds joke id + 1, or 0 when empty
+        self._slot_bits = max(4, (2 * capacity - 1).bit_length())
+        self.bands: List[array] = [self._empty_table() for _ in range(num_bands)]
+        self._feature_cache: Dict[str, array] = {}
+        # Serializes check-then-insert in add() across generator threads
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.signatures) // self.num_hashes
+
+    def signature(self, text: str) -> List[int]:
+        """Compute the 16-bit MinHash signature of a joke's content words.
+
+        Jokes without content words (emoji, punctuation, only stop words) get an
+        empty signature and are never treated as duplicates.
+        """
+        words = {w for w in _WORD_RE.findall(text.lower()) if w not in STOP_WORDS}
+        if not words:
+            return []
+        return list(map(min, zip(*map(self._feature_hashes, words))))
+
+    def similarity(self, first: str, second: str) -> float:
+        """Estimate the Jaccard similarity of two jokes."""
+        return self._agreement(self.signature(first), self.signature(second))
+
+    def find_duplicate(self, text: str) -> Optional[int]:
+        """Return the id of a stored near-duplicate, if there is one."""
+        signature = self.signature(text)
+        if not signature:
+            return None
+        with self._lock:
+            return self._find(signature, self._band_slots(signature))
+
+    def is_duplicate(self, text: str) -> bool:
+        """Check whether a near-duplicate of this joke is already indexed."""
+        return self.find_duplicate(text) is not None
+
+    def add(self, text: str) -> bool:
+        """Index a joke. Returns False if it was rejected as a near-duplicate."""
+        signature = self.signature(text)
+        if not signature:
+            # Nothing to compare on; accept it without indexing
+            return True
+        with self._lock:
+            slots = self._band_slots(signature)
+            if self._find(signature, slots) is not None:
+                return False
+            self._insert(signature, slots)
+        return True
+
+    def save(self, path: str):
+        """Write the index, band tables included, to disk in little-endian order."""
+        with self._lock:
+            signatures = _little_endian(self.signatures)
+            bands = [_little_endian(table) for table in self.bands]
+            count = len(self)
+        with open(path, 'wb') as f:
+            f.write(FILE_MAGIC)
+            f.write(FILE_HEADER.pack(self.threshold, self.num_bands, self.rows_per_band,
+                                     self.seed, count, self._slot_bits))
+            signatures.tofile(f)
+            for table in bands:
+                table.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> 'NearDuplicateIndex':
+        """Read an index previously written with save(); nothing is rebuilt."""
+        with open(path, 'rb') as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"Not a joke index file: {path}")
+            threshold, num_bands, rows_per_band, seed, count, slot_bits = \
+                FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+            index = cls(threshold, num_bands, rows_per_band, seed, capacity=1)
+            index._slot_bits = slot_bits
+            index.signatures.fromfile(f, count * index.num_hashes)
+            index.bands = []
+            for _ in range(num_bands):
+                table = array('I')
+                table.fromfile(f, 1 << slot_bits)
+                index.bands.append(table)
+
+        if sys.byteorder == 'big':
+            index.signatures.byteswap()
+            for table in index.bands:
+                table.byteswap()
+        return index
+
+    def _feature_hashes(self, feature: str) -> array:
+        """One stable 16-bit hash of a word per MinHash slot.
+
+        A single SHAKE-128 digest supplies all slots at once; Python's hash()
+        can't be used because it is salted per run.
+        """
+        hashes = self._feature_cache.get(feature)
+        if hashes is None:
+            digest = hashlib.shake_128(f'{self.seed}:{feature}'.encode('utf-8')).digest(2 * self.num_hashes)
+            hashes = array('H', digest)
+            if sys.byteorder == 'big':
+                # Keep signatures identical across platforms so saved indexes stay valid
+                hashes.byteswap()
+            if len(self._feature_cache) < 100000:
+                self._feature_cache[feature] = hashes
+        return hashes
+
+    def _empty_table(self) -> array:
+        return array('I', bytes(4 << self._slot_bits))
+
+    def _band_slots(self, signature) -> List[int]:
+        """Home slot of each band of a signature in the band tables."""
+        rows = self.rows_per_band
+        shift = 64 - self._slot_bits
+        slots = []
+        for offset in range(0, self.num_hashes, rows):
+            key = 0
+            for value in signature[offset:offset + rows]:
+                key = key << 16 | value
+            # Fibonacci hashing spreads the packed rows over the table
+            slots.append((key * _GOLDEN & _MASK64) >> shift)
+        return slots
+
+    def _agreement(self, first, second) -> float:
+        return sum(1 for x, y in zip(first, second) if x == y) / self.num_hashes
+
+    def _find(self, signature: List[int], slots: List[int]) -> Optional[int]:
+        signatures = self.signatures
+        num_hashes = self.num_hashes
+        rows = self.rows_per_band
+        mask = (1 << self._slot_bits) - 1
+        checked = set()
+        for band, (table, position) in enumerate(zip(self.bands, slots)):
+            offset = band * rows
+            band_values = signature[offset:offset + rows]
+            # Linear probing: every joke with this band key sits in this run of slots
+            while table[position]:
+                joke_id = table[position] - 1
+                start = joke_id * num_hashes + offset
+                if joke_id not in checked and signatures[start:start + rows].tolist() == band_values:
+                    checked.add(joke_id)
+                    start -= offset
+                    if self._agreement(signature, signatures[start:start + num_hashes]) >= self.threshold:
+                        return joke_id
+                position = (position + 1) & mask
+        return None
+
+    def _insert(self, signature: List[int], slots: List[int]):
+        joke_id = len(self)
+        self.signatures.extend(signature)
+        if 2 * (joke_id + 1) > 1 << self._slot_bits:
+            self._grow()
+        else:
+            self._add_to_bands(joke_id, slots)
+
+    def _add_to_bands(self, joke_id: int, slots: List[int]):
+        mask = (1 << self._slot_bits) - 1
+        for table, position in zip(self.bands, slots):
+            while table[position]:
+                position = (position + 1) & mask
+            table[position] = joke_id + 1
+
+    def _grow(self):
+        """Double every band table and re-add all jokes."""
+        self._slot_bits += 1
+        self.bands = [self._empty_table() for _ in range(self.num_bands)]
+        num_hashes = self.num_hashes
+        for joke_id in range(len(self)):
+            start = joke_id * num_hashes
+            self._add_to_bands(joke_id, self._band_slots(self.signatures[start:start + num_hashes]))
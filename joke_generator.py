@@ -7,14 +7,51 @@ A Python app that creates unique jokes using AWS Bedrock AI models.
 import boto3
 import json
 import random
+import time
 from typing import Dict, List, Optional
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
+from joke_dedup import NearDuplicateIndex
+from local_joke_engine import LocalJokeEngine
+from region_pool import RegionPool
+
 class BedrockJokeGenerator:
-    def __init__(self, region_name: str = 'us-east-1'):
-        """Initialize the Bedrock joke generator."""
+    def __init__(self, region_name: str = 'us-east-1', dedup_index: Optional[NearDuplicateIndex] = None,
+                 max_regenerations: int = 2, latency_budget: Optional[float] = None,
+                 fallback_engine: Optional[LocalJokeEngine] = None, regions: Optional[List[str]] = None,
+                 region_weights: Optional[Dict[str, float]] = None):
+        """Initialize the Bedrock joke generator.
+
+        When a ``dedup_index`` is given, jokes that are near-duplicates of
+        earlier output are regenerated up to ``max_regenerations`` times.
+
+        When a ``latency_budget`` (seconds) is set, Bedrock calls are bounded by
+        client timeouts with no retries, and a request that Bedrock can't
+        answer in time, or at all, is served by ``fallback_engine`` instead
+        (a LocalJokeEngine by default). Regenerations and region failovers are
+        only attempted while a full call still fits in the budget.
+
+        When ``regions`` is given, requests are spread across a client per
+        region (optionally weighted by ``region_weights``) and fail over away
+        from regions that throttle or return server errors.
+        """
         self.region_name = region_name
+        self.regions = regions
+        self.region_weights = region_weights
         self.bedrock_client = None
+        self.region_pool = None
+        self.dedup_index = dedup_index
+        self.max_regenerations = max_regenerations
+        self.latency_budget = latency_budget
+        self.fallback_engine = fallback_engine
+        if latency_budget is not None and fallback_engine is None:
+            self.fallback_engine = LocalJokeEngine()
+        self.client_config = self._create_client_config()
+        # Longest a single Bedrock call can take under the client timeouts
+        self.call_timeout = 0.0
+        if self.client_config is not None:
+            self.call_timeout = self.client_config.connect_timeout + self.client_config.read_timeout
         self.available_models = [
             'anthropic.claude-3-haiku-20240307-v1:0',
             'anthropic.claude-3-sonnet-20240229-v1:0',
@@ -34,12 +71,27 @@ class BedrockJokeGenerator:
         
         self._initialize_bedrock()
     
+    def _create_client_config(self) -> Optional[Config]:
+        """Bound each Bedrock call so connect + read fits in the latency budget."""
+        if self.latency_budget is None:
+            return None
+        connect_timeout = min(self.latency_budget / 2, 1.0)
+        return Config(
+            connect_timeout=connect_timeout,
+            read_timeout=self.latency_budget - connect_timeout,
+            retries={'max_attempts': 0}
+        )
+    
     def _initialize_bedrock(self):
         """Initialize the Bedrock client."""
+        if self.regions:
+            self._initialize_region_pool()
+            return
         try:
             self.bedrock_client = boto3.client(
                 service_name='bedrock-runtime',
-                region_name=self.region_name
+                region_name=self.region_name,
+                config=self.client_config
             )
             print("✅ AWS Bedrock client initialized successfully!")
         except NoCredentialsError:
@@ -48,8 +100,43 @@ class BedrockJokeGenerator:
         except Exception as e:
             print(f"❌ Error initializing Bedrock client: {str(e)}")
     
+    def _initialize_region_pool(self):
+        """Initialize one Bedrock client per configured region."""
+        clients = {}
+        for region in self.regions:
+            try:
+                clients[region] = boto3.client(service_name='bedrock-runtime', region_name=region,
+                                               config=self.client_config)
+            except NoCredentialsError:
+                print("❌ AWS credentials not found. Please configure your AWS credentials.")
+                print("   Run: aws configure")
+                return
+            except Exception as e:
+                print(f"❌ Error initializing Bedrock client in {region}: {str(e)}")
+        
+        if clients:
+            self.region_pool = RegionPool(clients, self.region_weights)
+            self.bedrock_client = next(iter(clients.values()))
+            print(f"✅ AWS Bedrock clients initialized in {', '.join(clients)}!")
+    
     def generate_joke(self, topic: str, style: str = 'witty', model: Optional[str] = None) -> str:
-        """Generate a joke using AWS Bedrock."""
+        """Generate a joke, degrading to the local engine if Bedrock is slow or failing."""
+        deadline = None
+        if self.latency_budget is not None:
+            deadline = time.monotonic() + self.latency_budget
+        joke = self.generate_remote_joke(topic, style, model, deadline)
+        
+        if self.fallback_engine is not None and joke.startswith('❌'):
+            return self.fallback_engine.generate_joke(topic, style, model)
+        return joke
+    
+    def generate_remote_joke(self, topic: str, style: str = 'witty', model: Optional[str] = None,
+                             deadline: Optional[float] = None) -> str:
+        """Generate a joke using AWS Bedrock only, never the local fallback engine.
+
+        Regenerations and failovers stop once a full call no longer fits before
+        ``deadline`` (a time.monotonic() value).
+        """
         if not self.bedrock_client:
             return "❌ Bedrock client not available. Please check your AWS configuration."
         
@@ -60,12 +147,22 @@ class BedrockJokeGenerator:
         prompt = self._create_prompt(topic, style_prompt)
         
         try:
-            if 'claude' in model_id:
-                return self._generate_with_claude(prompt, model_id)
-            elif 'titan' in model_id:
-                return self._generate_with_titan(prompt, model_id)
-            else:
+            if 'claude' not in model_id and 'titan' not in model_id:
                 return "❌ Unsupported model selected."
+            
+            joke = self._generate(prompt, model_id, deadline)
+            if self.dedup_index is not None:
+                for _ in range(self.max_regenerations):
+                    if self.dedup_index.add(joke):
+                        break
+                    if not self._fits_before(deadline):
+                        # No time for another call; a repeat beats no joke at all
+                        return joke
+                    joke = self._generate(prompt, model_id, deadline)
+                else:
+                    # Out of retries; still index the last attempt so it isn't repeated
+                    self.dedup_index.add(joke)
+            return joke
         
         except ClientError as e:
             error_code = e.response['Error']['Code']
@@ -78,6 +175,23 @@ class BedrockJokeGenerator:
         except Exception as e:
             return f"❌ Unexpected error: {str(e)}"
     
+    def _generate(self, prompt: str, model_id: str, deadline: Optional[float] = None) -> str:
+        """Dispatch a prompt to the right model family."""
+        if 'claude' in model_id:
+            return self._generate_with_claude(prompt, model_id, deadline)
+        return self._generate_with_titan(prompt, model_id, deadline)
+    
+    def _fits_before(self, deadline: Optional[float]) -> bool:
+        """Check whether a full Bedrock call can finish before the deadline."""
+        return deadline is None or deadline - time.monotonic() >= self.call_timeout
+    
+    def _invoke_model(self, model_id: str, body: Dict, deadline: Optional[float] = None):
+        """Send a request to Bedrock, through the region pool when configured."""
+        if self.region_pool:
+            return self.region_pool.invoke_model(deadline=deadline, call_timeout=self.call_timeout,
+                                                 modelId=model_id, body=json.dumps(body))
+        return self.bedrock_client.invoke_model(modelId=model_id, body=json.dumps(body))
+    
     def _create_prompt(self, topic: str, style_prompt: str) -> str:
         """Create a well-structured prompt for joke generation."""
         return f"""You are a professional comedian. {style_prompt} about the topic: "{topic}".
@@ -91,7 +205,7 @@ Requirements:
 Topic: {topic}
 Joke:"""
     
-    def _generate_with_claude(self, prompt: str, model_id: str) -> str:
+    def _generate_with_claude(self, prompt: str, model_id: str, deadline: Optional[float] = None) -> str:
         """Generate joke using Claude models."""
         body = {
             "anthropic_version": "bedrock-2023-05-31",
@@ -106,15 +220,12 @@ Joke:"""
             "top_p": 0.9
         }
         
-        response = self.bedrock_client.invoke_model(
-            modelId=model_id,
-            body=json.dumps(body)
-        )
+        response = self._invoke_model(model_id, body, deadline)
         
         response_body = json.loads(response['body'].read())
         return response_body['content'][0]['text'].strip()
     
-    def _generate_with_titan(self, prompt: str, model_id: str) -> str:
+    def _generate_with_titan(self, prompt: str, model_id: str, deadline: Optional[float] = None) -> str:
         """Generate joke using Titan models."""
         body = {
             "inputText": prompt,
@@ -126,10 +237,7 @@ Joke:"""
             }
         }
         
-        response = self.bedrock_client.invoke_model(
-            modelId=model_id,
-            body=json.dumps(body)
-        )
+        response = self._invoke_model(model_id, body, deadline)
         
         response_body = json.loads(response['body'].read())
         return response_body['results'][0]['outputText'].strip()
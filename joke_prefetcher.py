@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Joke Prefetcher
+Keeps a small pool of fresh, unused jokes ready for popular topics so
+interactive requests can be answered without waiting on AWS Bedrock.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from enhanced_limerick_generator import EnhancedLimerickGenerator
+from joke_generator import BedrockJokeGenerator
+
+
+class JokePrefetcher:
+    def __init__(self, generator: BedrockJokeGenerator,
+                 topics: Optional[List[str]] = None,
+                 styles: Optional[List[str]] = None,
+                 min_queue_size: int = 1,
+                 max_queue_size: int = 8,
+                 idle_interval: float = 0.5,
+                 demand_half_life: float = 300.0):
+        """Initialize the prefetcher for the given hot topics and styles.
+
+        Demand decays with a half-life of ``demand_half_life`` seconds, so queue
+        sizes follow what is popular now rather than all-time request counts.
+        """
+        self.generator = generator
+        self.topics = topics or EnhancedLimerickGenerator().topic_suggestions
+        self.styles = styles or ['witty']
+        self.min_queue_size = min_queue_size
+        self.max_queue_size = max_queue_size
+        self.idle_interval = idle_interval
+        self.demand_half_life = demand_half_life
+
+        # One bounded queue of unused jokes per (topic, style)
+        self.queues: Dict[Tuple[str, str], Deque[str]] = {
+            (topic, style): deque(maxlen=max_queue_size)
+            for topic in self.topics for style in self.styles
+        }
+        # Decayed request counts per (topic, style), used to size each queue
+        self.demand: Dict[Tuple[str, str], float] = {}
+        self._demand_updated = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start refilling the queues in a background thread."""
+        if self._worker and self._worker.is_alive():
+            return
+        self._stopped.clear()
+        self._worker = threading.Thread(target=self._refill_loop, name='joke-prefetcher', daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background refill thread."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._worker:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def get_joke(self, topic: str, style: str = 'witty', model: Optional[str] = None) -> str:
+        """Serve a prefetched joke, falling back to a live Bedrock call.
+
+        Queues are filled with the generator's current model, so a request for
+        a specific ``model`` always goes to the live call.
+        """
+        key = (topic.strip().lower(), style)
+        with self._lock:
+            self._decay_demand()
+            self.demand[key] = self.demand.get(key, 0.0) + 1
+            queue = self.queues.get(key) if model is None else None
+            joke = queue.popleft() if queue else None
+
+        if joke is not None:
+            # Let the worker top the queue back up
+            self._wakeup.set()
+            return joke
+        return self.generator.generate_joke(topic, style, model)
+
+    def get_queue_sizes(self) -> Dict[Tuple[str, str], int]:
+        """Get the number of ready jokes for each topic and style."""
+        with self._lock:
+            return {key: len(queue) for key, queue in self.queues.items()}
+
+    def _decay_demand(self):
+        """Age demand counts by the time since they were last updated."""
+        now = time.monotonic()
+        factor = 0.5 ** ((now - self._demand_updated) / self.demand_half_life)
+        self._demand_updated = now
+        for key in list(self.demand):
+            self.demand[key] *= factor
+            if self.demand[key] < 0.01:
+                del self.demand[key]
+
+    def _target_size(self, key: Tuple[str, str]) -> int:
+        """Size a queue in proportion to its share of recent demand."""
+        total = sum(self.demand.values())
+        if not total:
+            return self.min_queue_size
+        share = self.demand.get(key, 0.0) / total
+        return max(self.min_queue_size, round(share * self.max_queue_size * len(self.queues) / 2))
+
+    def _next_refill(self) -> Optional[Tuple[str, str]]:
+        """Pick the queue that is furthest below its target size."""
+        with self._lock:
+            self._decay_demand()
+            best_key, best_gap = None, 0
+            for key, queue in self.queues.items():
+                gap = min(self._target_size(key), self.max_queue_size) - len(queue)
+                if gap > best_gap:
+                    best_key, best_gap = key, gap
+            return best_key
+
+    def _refill_loop(self):
+        """Refill the queues one joke at a time until stopped."""
+        while not self._stopped.is_set():
+            key = self._next_refill()
+            if key is None:
+                # Everything is full; sleep until a joke is served
+                self._wakeup.wait(self.idle_interval)
+                self._wakeup.clear()
+                continue
+
+            topic, style = key
+            # Refill from Bedrock only, so local fallback jokes are never queued as fresh
+            joke = self.generator.generate_remote_joke(topic, style)
+            if joke.startswith('❌'):
+                # Don't cache errors; back off before trying again
+                self._stopped.wait(self.idle_interval)
+                continue
+
+            with self._lock:
+                self.queues[key].append(joke)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Local Joke Engine
+An offline, template-driven joke backend with the same interface as the
+Bedrock joke generator, used when the remote model is slow or unavailable.
+"""
+
+import random
+from typing import Dict, List, Optional
+
+from enhanced_limerick_generator import EnhancedLimerickGenerator
+
+
+class LocalJokeEngine:
+    def __init__(self):
+        """Initialize the local joke engine."""
+        # Share the limerick generator's topic word banks
+        self.limerick_generator = EnhancedLimerickGenerator()
+
+        # Track recent templates to avoid repetition
+        self.recent_templates = []
+        self.max_recent = 5
+
+        # Joke templates per style
+        self.templates = {
+            'pun': [
+                "I tried to {action} once, but it wasn't my {topic} of tea.",
+                "{a_adj} {noun} walked into a bar. The bartender said, \"Why the long {topic}?\"",
+                "I'm reading a book about {topic}. It's impossible to put down - the {noun} {verb} it shut."
+            ],
+            'dad': [
+                "Why did the {noun} quit {topic}? It just couldn't {action} anymore!",
+                "What do you call {a_adj} {noun}? A {topic} enthusiast with no off switch!",
+                "My {noun} {verb} all day, so I asked why. Apparently {topic} doesn't {action} by itself."
+            ],
+            'witty': [
+                "{a_adj} {noun} is just someone who decided to {action} before anyone could stop them.",
+                "They say {topic} builds character. Mostly it builds {adj} {noun}s.",
+                "My relationship with {topic} is simple: I {action}, and it pretends not to notice."
+            ],
+            'silly': [
+                "Why did the {noun} wear socks to {topic} class? To {action} without cold feet!",
+                "Breaking news: local {noun} {verb} so hard it became slightly {adj}.",
+                "If a {noun} {verb} in the forest and nobody saw it, was it still {adj}?"
+            ],
+            'observational': [
+                "Have you noticed every {noun} thinks they're the first to {action}?",
+                "Nobody is more {adj} than a {noun} explaining {topic} at a party.",
+                "Why is it that the moment you start to {action}, everyone becomes a {topic} expert?"
+            ],
+            'wordplay': [
+                "{topic} fans never panic. They just {action} and call it a plan.",
+                "The {adj} {noun} {verb}, then {verb2} - a {topic} story in two acts.",
+                "Some people {action} for fun. A {noun} does it for the sheer {topic} of it."
+            ]
+        }
+
+    def generate_joke(self, topic: str, style: str = 'witty', model: Optional[str] = None) -> str:
+        """Generate a joke locally. ``model`` is accepted for interface parity and ignored."""
+        topic_key = topic.strip().lower()
+        words = self._get_words(topic_key)
+        templates = self.templates.get(style, self.templates['witty'])
+
+        # Prefer a template we haven't used recently
+        candidates = [t for t in templates if t not in self.recent_templates] or templates
+        template = random.choice(candidates)
+        self.recent_templates.append(template)
+        if len(self.recent_templates) > self.max_recent:
+            self.recent_templates.pop(0)
+
+        adj = random.choice(words['adjectives'])
+        joke = template.format(
+            topic=topic.strip(),
+            noun=random.choice(words['nouns']),
+            verb=random.choice(words['verbs']),
+            verb2=random.choice(words['verbs']),
+            adj=adj,
+            a_adj=f"{'an' if adj[0] in 'aeiou' else 'a'} {adj}",
+            action=random.choice(words['actions'])
+        )
+        return joke[0].upper() + joke[1:]
+
+    def get_available_styles(self) -> List[str]:
+        """Get list of available joke styles."""
+        return list(self.templates.keys())
+
+    def _get_words(self, topic: str) -> Dict[str, List[str]]:
+        """Get topic-specific words, falling back to generic ones."""
+        generator = self.limerick_generator
+        return generator.topic_words.get(topic) or generator._get_default_words(topic)
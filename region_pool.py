@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Bedrock Region Pool
+Spreads invoke_model calls across several AWS regions by weighted
+least-outstanding-requests, and fails over away from regions that are
+throttling or returning server errors.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Error codes that mean "this region is overloaded", not "this request is bad"
+RETRYABLE_ERROR_CODES = {
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'ServiceUnavailableException',
+    'ModelNotReadyException',
+    'InternalServerException',
+    'ModelTimeoutException'
+}
+
+
+def is_region_failure(error: Exception) -> bool:
+    """Check whether an error should take its region out of rotation."""
+    if isinstance(error, ClientError):
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        return error.response['Error']['Code'] in RETRYABLE_ERROR_CODES or status == 429 or status >= 500
+    # Connection failures, timeouts, etc.
+    return isinstance(error, BotoCoreError)
+
+
+class RegionState:
+    __slots__ = ('name', 'client', 'weight', 'outstanding', 'ejected_until', 'eject_seconds', 'probing')
+
+    def __init__(self, name: str, client, weight: float, eject_seconds: float):
+        self.name = name
+        self.client = client
+        self.weight = weight
+        self.outstanding = 0
+        self.ejected_until = 0.0
+        self.eject_seconds = eject_seconds
+        self.probing = False
+
+    @property
+    def healthy(self) -> bool:
+        return not self.ejected_until
+
+
+class RegionPool:
+    def __init__(self, clients: Dict[str, object], weights: Optional[Dict[str, float]] = None,
+                 eject_seconds: float = 5.0, max_eject_seconds: float = 120.0):
+        """Initialize the pool with one Bedrock runtime client per region.
+
+        A region that fails is ejected for ``eject_seconds``. Once that expires,
+        a single live request is let through as a health probe: success brings
+        the region back, failure ejects it again for twice as long (up to
+        ``max_eject_seconds``).
+
+        Regions weigh 1.0 unless given in ``weights``; a weight of 0 drains a
+        region, leaving it out of the pool entirely.
+        """
+        weights = weights or {}
+        for name, weight in weights.items():
+            if weight < 0:
+                raise ValueError(f"Region weight must not be negative: {name}={weight}")
+        self.base_eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self.regions = [
+            RegionState(name, client, weights.get(name, 1.0), eject_seconds)
+            for name, client in clients.items()
+            if weights.get(name, 1.0) > 0
+        ]
+        if not self.regions:
+            raise ValueError("RegionPool needs at least one region client with a positive weight")
+        self._lock = threading.Lock()
+
+    def invoke_model(self, deadline: Optional[float] = None, call_timeout: float = 0.0, **kwargs):
+        """Call invoke_model in the best region, failing over on region errors.
+
+        No failover is attempted unless a full call of ``call_timeout`` seconds
+        still fits before ``deadline`` (a time.monotonic() value).
+        """
+        tried = set()
+        while True:
+            region = self.acquire(exclude=tried)
+            # Anything other than a clean response or a request error counts
+            # against the region, so it can never stay acquired or probing
+            healthy = False
+            try:
+                response = region.client.invoke_model(**kwargs)
+                healthy = True
+                return response
+            except (ClientError, BotoCoreError) as e:
+                if not is_region_failure(e):
+                    healthy = True
+                    raise
+                tried.add(region.name)
+                if len(tried) == len(self.regions):
+                    raise
+                if deadline is not None and deadline - time.monotonic() < call_timeout:
+                    raise
+            finally:
+                self.release(region, healthy)
+
+    def acquire(self, exclude: Iterable[str] = ()) -> RegionState:
+        """Pick a region for the next request and count it as outstanding."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [r for r in self.regions if r.name not in exclude] or self.regions
+
+            # Let one request through to any region whose ejection has expired
+            region = next((r for r in candidates
+                           if not r.healthy and not r.probing and r.ejected_until <= now), None)
+            if region is not None:
+                region.probing = True
+            else:
+                healthy = [r for r in candidates if r.healthy]
+                if healthy:
+                    # Weighted least outstanding requests; ties (e.g. when idle)
+                    # are spread at random in proportion to weight
+                    load = {r.name: r.outstanding / r.weight for r in healthy}
+                    lightest = min(load.values())
+                    tied = [r for r in healthy if load[r.name] == lightest]
+                    region = random.choices(tied, weights=[r.weight for r in tied])[0]
+                else:
+                    # Everything is ejected; use whichever comes back soonest
+                    region = min(candidates, key=lambda r: r.ejected_until)
+
+            region.outstanding += 1
+            return region
+
+    def release(self, region: RegionState, healthy: bool):
+        """Record the outcome of a request sent to a region."""
+        with self._lock:
+            region.outstanding -= 1
+            if healthy:
+                if region.probing or not region.healthy:
+                    print(f"✅ Bedrock region {region.name} is healthy again")
+                region.ejected_until = 0.0
+                region.eject_seconds = self.base_eject_seconds
+            elif region.probing:
+                # Failed health probe: stay out of rotation for longer
+                region.eject_seconds = min(region.eject_seconds * 2, self.max_eject_seconds)
+                region.ejected_until = time.monotonic() + region.eject_seconds
+            elif region.healthy:
+                print(f"⚠️  Ejecting Bedrock region {region.name} for {region.eject_seconds:.0f}s")
+                region.ejected_until = time.monotonic() + region.eject_seconds
+            region.probing = False
+
+    def get_status(self) -> Dict[str, Dict[str, object]]:
+        """Get the load and health of each region."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                r.name: {
+                    'weight': r.weight,
+                    'outstanding': r.outstanding,
+                    'healthy': r.healthy,
+                    'ejected_for': max(0.0, r.ejected_until - now)
+                }
+                for r in self.regions
+            }
@@ -133,6 +133,8 @@ def main():
             print(f"\n🎉 Setup Complete! You can use the joke generator.")
             print(f"   Recommended region: {region}")
             print(f"   Available models: {len(accessible_models)}")
+            if len(accessible_regions) > 1:
+                print(f"   Tip: spread load with BedrockJokeGenerator(regions={accessible_regions})")
         else:
             print(f"\n❌ No models accessible in {region}")
 
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Tests for the resumable batch runner, using a stub joke generator
+"""
+
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+import batch_runner
+from batch_runner import BatchRunner
+
+class StubJokeGenerator:
+    """Stands in for BedrockJokeGenerator without calling AWS."""
+    
+    def __init__(self, delay=0.0, fail_on=()):
+        self.delay = delay
+        self.fail_on = set(fail_on)
+        self.calls = []
+        self.active = 0
+        self.peak_active = 0
+        self._lock = threading.Lock()
+    
+    def generate_joke(self, topic, style='witty', model=None):
+        with self._lock:
+            self.calls.append(topic)
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        try:
+            time.sleep(random.random() * self.delay)
+            if topic in self.fail_on:
+                raise RuntimeError(f"boom on {topic}")
+            return f"joke about {topic}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+def write_requests(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write((line if isinstance(line, str) else json.dumps(line)) + '\n')
+
+def read_results(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def run(tmp, lines, generator, **kwargs):
+    input_path = os.path.join(tmp, 'requests.jsonl')
+    output_path = os.path.join(tmp, 'results.jsonl')
+    write_requests(input_path, lines)
+    runner = BatchRunner(output_path, joke_generator=generator, progress_interval=60, **kwargs)
+    processed = runner.run(input_path)
+    return processed, output_path
+
+def test_results_are_written_in_input_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        lines = [{'topic': f't{i}', 'kind': 'limerick' if i % 7 == 0 else 'joke'} for i in range(100)]
+        generator = StubJokeGenerator(delay=0.01)
+        processed, output_path = run(tmp, lines, generator, concurrency=8)
+        
+        results = read_results(output_path)
+        assert processed == 100
+        assert [r['index'] for r in results] == list(range(100))
+        assert [r['topic'] for r in results] == [f't{i}' for i in range(100)]
+        assert all(r['ok'] for r in results)
+        assert not os.path.exists(output_path + '.partial')
+
+def test_in_flight_work_is_bounded():
+    consumed = []
+    original = batch_runner.read_requests
+    
+    def counting_read_requests(path):
+        consumed.clear()
+        for item in original(path):
+            consumed.append(item[0])
+            yield item
+    
+    class BoundCheckingGenerator(StubJokeGenerator):
+        def generate_joke(self, topic, style='witty', model=None):
+            # Requests read so far minus those finished never exceeds the bound
+            assert len(consumed) - len(self.calls) + self.active <= 3, "too many requests in flight"
+            return super().generate_joke(topic, style, model)
+    
+    batch_runner.read_requests = counting_read_requests
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            generator = BoundCheckingGenerator(delay=0.005)
+            _, output_path = run(tmp, [{'topic': f't{i}'} for i in range(50)], generator,
+                                 concurrency=2, max_in_flight=3)
+            # A failed bound check surfaces as a ❌ result
+            assert all(r['ok'] for r in read_results(output_path))
+            assert len(generator.calls) == 50
+            assert generator.peak_active <= 2
+    finally:
+        batch_runner.read_requests = original
+
+def test_slow_request_bounds_results_waiting_to_be_written():
+    class SlowFirstGenerator(StubJokeGenerator):
+        def generate_joke(self, topic, style='witty', model=None):
+            if topic == 't0':
+                time.sleep(0.2)
+                self.calls_before_t0_done = len(self.calls)
+            return super().generate_joke(topic, style, model)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = SlowFirstGenerator()
+        _, output_path = run(tmp, [{'topic': f't{i}'} for i in range(50)], generator,
+                             concurrency=4, max_in_flight=4)
+        
+        # Only t1..t3 may finish while t0 holds up the output
+        assert generator.calls_before_t0_done <= 3
+        assert [r['index'] for r in read_results(output_path)] == list(range(50))
+
+def test_bad_requests_do_not_abort_the_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        lines = [{'topic': 'cat'}, '{bad json', '[1, 2]', '"cat"', 'null', {'topic': 'boom'}, {'topic': 'dog'}]
+        processed, output_path = run(tmp, lines, StubJokeGenerator(fail_on=['boom']))
+        
+        results = read_results(output_path)
+        assert processed == 7
+        assert [r['ok'] for r in results] == [True, False, False, False, False, False, True]
+        assert results[5]['result'] == "❌ Unexpected error: boom on boom"
+
+def test_resume_from_checkpoint_only_runs_missing_requests():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, 'results.jsonl')
+        lines = [{'topic': f't{i}'} for i in range(6)]
+        
+        # A crashed run: one line written, a torn second line, three results checkpointed
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'index': 0, 'ok': True, 'result': 'joke about t0'}) + '\n')
+            f.write('{"index": 1, "ok": tr')
+        with open(output_path + '.partial', 'w', encoding='utf-8') as f:
+            for i in (2, 3, 5):
+                f.write(json.dumps({'index': i, 'ok': True, 'result': f'joke about t{i}'}) + '\n')
+            f.write('{"index": 4')
+        
+        # The resumed run crashes too, after journaling t4 but before t1 is done
+        class Crash(BaseException):
+            pass
+        
+        class CrashingGenerator(StubJokeGenerator):
+            def generate_joke(self, topic, style='witty', model=None):
+                if topic == 't1':
+                    time.sleep(0.05)
+                    raise Crash()
+                return super().generate_joke(topic, style, model)
+        
+        generator = CrashingGenerator()
+        try:
+            run(tmp, lines, generator)
+        except Crash:
+            pass
+        else:
+            raise AssertionError("expected the resumed run to crash")
+        assert generator.calls == ['t4']
+        assert sorted(r['index'] for r in read_results(output_path + '.partial')) == [2, 3, 4, 5]
+        
+        generator = StubJokeGenerator()
+        processed, _ = run(tmp, lines, generator)
+        
+        assert generator.calls == ['t1']
+        assert processed == 1
+        results = read_results(output_path)
+        assert [r['index'] for r in results] == list(range(6))
+        assert not os.path.exists(output_path + '.partial')
+
+def test_resume_with_everything_checkpointed():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, 'results.jsonl')
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'index': 0, 'ok': True, 'result': 'joke about t0'}) + '\n')
+        with open(output_path + '.partial', 'w', encoding='utf-8') as f:
+            for i in (1, 2, 3):
+                f.write(json.dumps({'index': i, 'ok': True, 'result': f'joke about t{i}'}) + '\n')
+        
+        generator = StubJokeGenerator()
+        processed, _ = run(tmp, [{'topic': f't{i}'} for i in range(4)], generator)
+        
+        assert processed == 0
+        assert generator.calls == []
+        assert [r['index'] for r in read_results(output_path)] == [0, 1, 2, 3]
+        assert not os.path.exists(output_path + '.partial')
+
+def test_recover_output_scans_in_chunks():
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, 'results.jsonl')
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write('{"index": 0}\n' * 10 + '{"index": 10, "res')
+        
+        runner = BatchRunner(output_path, joke_generator=StubJokeGenerator())
+        assert runner._recover_output(chunk_size=7) == 10
+        with open(output_path, encoding='utf-8') as f:
+            assert f.read() == '{"index": 0}\n' * 10
+
+if __name__ == "__main__":
+    test_results_are_written_in_input_order()
+    test_in_flight_work_is_bounded()
+    test_slow_request_bounds_results_waiting_to_be_written()
+    test_bad_requests_do_not_abort_the_batch()
+    test_resume_from_checkpoint_only_runs_missing_requests()
+    test_resume_with_everything_checkpointed()
+    test_recover_output_scans_in_chunks()
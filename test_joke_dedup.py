@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the near-duplicate joke index
+"""
+
+import os
+import tempfile
+import threading
+
+from joke_dedup import NearDuplicateIndex
+
+JOKE = "Why do programmers prefer dark mode? Because light attracts bugs!"
+REWORDED = "Why do coders prefer dark mode? Light attracts bugs!"
+OTHER = "I told my cat a joke about coffee, but it just wasn't her cup of tea."
+
+def test_add_rejects_near_duplicates():
+    index = NearDuplicateIndex()
+    assert index.add(JOKE)
+    assert not index.add(REWORDED)
+    assert index.add(OTHER)
+    assert len(index) == 2
+
+def test_jokes_without_content_words_are_not_duplicates():
+    index = NearDuplicateIndex()
+    assert index.add("!!!")
+    assert index.add("???")
+    assert index.add("🎭 🎉")
+    assert not index.is_duplicate("Why is it, though?")
+    assert len(index) == 0
+
+def test_save_and_load_round_trip():
+    index = NearDuplicateIndex(threshold=0.5)
+    index.add(JOKE)
+    index.add(OTHER)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'jokes.idx')
+        index.save(path)
+        restored = NearDuplicateIndex.load(path)
+    
+    assert len(restored) == 2
+    assert restored.threshold == 0.5
+    assert restored.is_duplicate(REWORDED)
+    assert not restored.is_duplicate("A SQL query walks into a bar and joins two tables.")
+    assert not restored.add(JOKE)
+
+def test_band_tables_grow_and_load_without_rebuilding():
+    index = NearDuplicateIndex(capacity=1)
+    jokes = [f"Robot{n} trades gadget{n} for sprocket{n} at market{n}" for n in range(200)]
+    for joke in jokes:
+        assert index.add(joke)
+    assert len(index.bands[0]) >= 2 * len(index)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'jokes.idx')
+        index.save(path)
+        restored = NearDuplicateIndex.load(path)
+    
+    assert restored.bands == index.bands
+    assert restored.signatures == index.signatures
+    assert all(restored.is_duplicate(joke) for joke in jokes)
+    assert restored.add(OTHER)
+
+def test_concurrent_adds_keep_one_copy():
+    index = NearDuplicateIndex()
+    accepted = []
+    barrier = threading.Barrier(8)
+    
+    def worker():
+        barrier.wait()
+        accepted.append(index.add(JOKE))
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert accepted.count(True) == 1
+    assert len(index) == 1
+
+if __name__ == "__main__":
+    test_add_rejects_near_duplicates()
+    test_jokes_without_content_words_are_not_duplicates()
+    test_save_and_load_round_trip()
+    test_band_tables_grow_and_load_without_rebuilding()
+    test_concurrent_adds_keep_one_copy()
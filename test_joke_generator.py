@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the Bedrock joke generator's latency budget, using stub clients
+"""
+
+import io
+import json
+import threading
+import time
+
+from botocore.exceptions import ClientError, ReadTimeoutError
+
+from joke_dedup import NearDuplicateIndex
+from joke_generator import BedrockJokeGenerator
+from region_pool import RegionPool
+
+def throttled():
+    return ClientError({'Error': {'Code': 'ThrottlingException'},
+                        'ResponseMetadata': {'HTTPStatusCode': 429}}, 'InvokeModel')
+
+class StubClient:
+    """Stands in for a bedrock-runtime client."""
+    
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def invoke_model(self, modelId, body):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        text = json.dumps({'content': [{'text': 'remote joke'}]})
+        return {'body': io.BytesIO(text.encode())}
+
+def test_latency_budget_bounds_client_timeouts():
+    generator = BedrockJokeGenerator(latency_budget=0.5)
+    config = generator.bedrock_client.meta.config
+    assert config.connect_timeout + config.read_timeout <= 0.5
+    assert config.retries['total_max_attempts'] == 1
+
+def test_concurrent_calls_within_budget_stay_remote():
+    generator = BedrockJokeGenerator(latency_budget=0.5)
+    client = generator.bedrock_client = StubClient(delay=0.3)
+    jokes = []
+    
+    def worker():
+        jokes.append(generator.generate_joke('cat'))
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert jokes == ['remote joke'] * 8
+    assert client.calls == 8
+
+def test_timeout_falls_back_to_local_engine():
+    generator = BedrockJokeGenerator(latency_budget=0.5)
+    client = generator.bedrock_client = StubClient(error=ReadTimeoutError(endpoint_url='https://bedrock'))
+    joke = generator.generate_joke('cat', 'dad')
+    assert not joke.startswith('❌')
+    assert joke != 'remote joke'
+    assert client.calls == 1
+
+def test_duplicate_is_kept_when_no_time_to_regenerate():
+    index = NearDuplicateIndex()
+    index.add('remote joke')
+    generator = BedrockJokeGenerator(dedup_index=index, latency_budget=0.5)
+    client = generator.bedrock_client = StubClient(delay=0.45)
+    
+    started = time.monotonic()
+    assert generator.generate_joke('cat') == 'remote joke'
+    assert time.monotonic() - started <= 0.5
+    assert client.calls == 1
+
+def test_no_failover_without_time_for_another_call():
+    generator = BedrockJokeGenerator(latency_budget=0.5)
+    clients = {name: StubClient(delay=0.45, error=throttled()) for name in ('us-east-1', 'us-west-2')}
+    generator.region_pool = RegionPool(clients)
+    generator.bedrock_client = clients['us-east-1']
+    
+    started = time.monotonic()
+    joke = generator.generate_joke('cat')
+    assert time.monotonic() - started <= 0.5
+    assert not joke.startswith('❌') and joke != 'remote joke'
+    assert sum(client.calls for client in clients.values()) == 1
+
+def test_without_fallback_errors_are_returned():
+    generator = BedrockJokeGenerator()
+    generator.bedrock_client = StubClient(error=ReadTimeoutError(endpoint_url='https://bedrock'))
+    assert generator.generate_joke('cat').startswith('❌')
+
+if __name__ == "__main__":
+    test_latency_budget_bounds_client_timeouts()
+    test_concurrent_calls_within_budget_stay_remote()
+    test_timeout_falls_back_to_local_engine()
+    test_duplicate_is_kept_when_no_time_to_regenerate()
+    test_no_failover_without_time_for_another_call()
+    test_without_fallback_errors_are_returned()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the background joke prefetcher
+"""
+
+import time
+
+from joke_prefetcher import JokePrefetcher
+
+class StubGenerator:
+    """Stands in for BedrockJokeGenerator without calling AWS."""
+    
+    def __init__(self):
+        self.remote_calls = 0
+    
+    def generate_remote_joke(self, topic, style='witty', model=None, deadline=None):
+        self.remote_calls += 1
+        return f"remote {topic} {style} #{self.remote_calls}"
+    
+    def generate_joke(self, topic, style='witty', model=None):
+        # What a generator with a latency budget returns when it degrades
+        return f"local {topic} {style} {model}"
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_prefetched_jokes_come_from_bedrock():
+    generator = StubGenerator()
+    prefetcher = JokePrefetcher(generator, topics=['cat', 'dog'], max_queue_size=4, idle_interval=0.01)
+    prefetcher.start()
+    try:
+        assert wait_for(lambda: all(prefetcher.get_queue_sizes().values()))
+        joke = prefetcher.get_joke('cat')
+        assert joke.startswith('remote cat witty')
+    finally:
+        prefetcher.stop(1)
+
+def test_empty_queue_falls_back_to_live_call():
+    prefetcher = JokePrefetcher(StubGenerator(), topics=['cat'])
+    assert prefetcher.get_joke('pizza') == 'local pizza witty None'
+
+def test_model_is_passed_to_live_call():
+    generator = StubGenerator()
+    prefetcher = JokePrefetcher(generator, topics=['cat'], max_queue_size=4, idle_interval=0.01)
+    prefetcher.start()
+    try:
+        assert wait_for(lambda: all(prefetcher.get_queue_sizes().values()))
+        # Prefetched jokes come from the default model, so an explicit model skips the queue
+        assert prefetcher.get_joke('cat', 'witty', 'amazon.titan-text-express-v1') == \
+            'local cat witty amazon.titan-text-express-v1'
+    finally:
+        prefetcher.stop(1)
+
+def test_demand_decays():
+    prefetcher = JokePrefetcher(StubGenerator(), topics=['cat', 'dog'], demand_half_life=0.05)
+    for _ in range(10):
+        prefetcher.get_joke('cat')
+    time.sleep(0.2)
+    prefetcher.get_joke('dog')
+    # Old demand for 'cat' has halved four times and now trails fresh demand for 'dog'
+    assert prefetcher.demand[('cat', 'witty')] < prefetcher.demand[('dog', 'witty')]
+
+if __name__ == "__main__":
+    test_prefetched_jokes_come_from_bedrock()
+    test_empty_queue_falls_back_to_live_call()
+    test_model_is_passed_to_live_call()
+    test_demand_decays()
@@ -3,8 +3,10 @@
 Test script to demonstrate the limerick generators
 """
 
+import sys
+
 from limerick_generator import LimerickGenerator
-from enhanced_limerick_generator import EnhancedLimerickGenerator
+from enhanced_limerick_generator import EnhancedLimerickGenerator, LimerickBuffer
 
 def test_generators():
     print("🧪 Testing Limerick Generators")
@@ -29,5 +31,47 @@ def test_generators():
         print("-" * 20)
         print(enhanced_gen.generate_limerick(topic))
 
+def test_compact_limericks():
+    generator = EnhancedLimerickGenerator()
+    limericks = [generator.generate_limerick(topic, compact=True) for topic in ['cat', 'programming', 'jazz'] * 10]
+    
+    # Rendering is repeatable and yields a full five-line limerick
+    for limerick in limericks:
+        assert limerick.render() == str(limerick)
+        assert len(limerick.render().split('\n')) == 5
+        # Only the middle lines the template uses are recorded
+        assert len(limerick.ids) <= 22
+        assert sys.getsizeof(limerick) + sys.getsizeof(limerick.ids) < sys.getsizeof(limerick.render())
+    
+    # Packed records survive a round trip through bytes
+    buffer = LimerickBuffer(generator)
+    buffer.extend(limericks)
+    restored = LimerickBuffer.from_bytes(generator, buffer.to_bytes())
+    assert len(restored) == len(limericks)
+    assert [l.render() for l in restored] == [l.render() for l in limericks]
+
+def test_limerick_buffer_topics_round_trip():
+    generator = EnhancedLimerickGenerator()
+    
+    # Topics with newlines, empty topics and non-ASCII survive serialization
+    for topics in [['x', 'a\nb'], [''], ['café', '🐱', '']]:
+        buffer = LimerickBuffer(generator)
+        buffer.extend(generator.generate_limerick(topic, compact=True) for topic in topics)
+        restored = LimerickBuffer.from_bytes(generator, buffer.to_bytes())
+        assert restored.topics == buffer.topics
+        assert [l.render() for l in restored] == [l.render() for l in buffer]
+    
+    # More distinct topics than fit in 16-bit ids
+    buffer = LimerickBuffer(generator)
+    limerick = generator.generate_limerick('cat', compact=True)
+    for i in range(70000):
+        limerick.topic = f'topic {i}'
+        buffer.append(limerick)
+    restored = LimerickBuffer.from_bytes(generator, buffer.to_bytes())
+    assert len(restored) == 70000
+    assert restored[-1].topic == 'topic 69999'
+
 if __name__ == "__main__":
-    test_generators()
\ No newline at end of file
+    test_generators()
+    test_compact_limericks()
+    test_limerick_buffer_topics_round_trip()
\ No newline at end of file
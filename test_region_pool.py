@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-region load spreading and failover, using stub clients
+"""
+
+import time
+from collections import Counter
+
+from botocore.exceptions import ClientError
+
+from region_pool import RegionPool
+
+def throttled():
+    return ClientError({'Error': {'Code': 'ThrottlingException'},
+                        'ResponseMetadata': {'HTTPStatusCode': 429}}, 'InvokeModel')
+
+def access_denied():
+    return ClientError({'Error': {'Code': 'AccessDeniedException'},
+                        'ResponseMetadata': {'HTTPStatusCode': 403}}, 'InvokeModel')
+
+class StubClient:
+    """Stands in for a bedrock-runtime client in one region."""
+    
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+        self.error = None
+    
+    def invoke_model(self, **kwargs):
+        self.calls[self.name] += 1
+        if self.error:
+            raise self.error
+        return self.name
+
+def make_pool(names=('us-east-1', 'us-west-2', 'eu-west-1'), **kwargs):
+    calls = Counter()
+    clients = {name: StubClient(name, calls) for name in names}
+    return RegionPool(clients, **kwargs), clients, calls
+
+def expire_ejection(pool, name):
+    region = next(r for r in pool.regions if r.name == name)
+    region.ejected_until = 1.0
+
+def test_requests_spread_by_weight():
+    pool, _, calls = make_pool(weights={'us-east-1': 2})
+    for _ in range(4000):
+        pool.invoke_model(modelId='m', body='{}')
+    assert 1800 < calls['us-east-1'] < 2200
+    assert 800 < calls['us-west-2'] < 1200
+
+def test_zero_weight_drains_region_and_negative_is_rejected():
+    pool, _, calls = make_pool(weights={'us-west-2': 0})
+    for _ in range(100):
+        pool.invoke_model(modelId='m', body='{}')
+    assert calls['us-west-2'] == 0
+    
+    for weights in [{'us-east-1': -1}, {'us-east-1': 0, 'us-west-2': 0, 'eu-west-1': 0}]:
+        try:
+            make_pool(weights=weights)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"weights {weights} should be rejected")
+
+def test_throttled_region_is_ejected_and_request_fails_over():
+    pool, clients, calls = make_pool(names=('us-east-1', 'us-west-2'))
+    clients['us-east-1'].error = throttled()
+    
+    results = [pool.invoke_model(modelId='m', body='{}') for _ in range(20)]
+    assert results == ['us-west-2'] * 20
+    # Only the first request hit the throttled region before it was ejected
+    assert calls['us-east-1'] == 1
+    assert not pool.get_status()['us-east-1']['healthy']
+
+def test_request_errors_neither_eject_nor_fail_over():
+    pool, clients, calls = make_pool(names=('us-east-1',))
+    clients['us-east-1'].error = access_denied()
+    try:
+        pool.invoke_model(modelId='m', body='{}')
+    except ClientError:
+        pass
+    assert calls['us-east-1'] == 1
+    assert pool.get_status()['us-east-1']['healthy']
+
+def test_probe_restores_region_or_backs_off():
+    pool, clients, calls = make_pool(names=('us-east-1', 'us-west-2'), eject_seconds=5, max_eject_seconds=15)
+    clients['us-east-1'].error = throttled()
+    pool.invoke_model(modelId='m', body='{}')
+    region = pool.regions[0]
+    
+    # Failed probes double the ejection time, up to the cap
+    for expected in (10, 15, 15):
+        expire_ejection(pool, 'us-east-1')
+        assert pool.invoke_model(modelId='m', body='{}') == 'us-west-2'
+        assert region.eject_seconds == expected
+    
+    # A successful probe brings the region back with the base ejection time
+    clients['us-east-1'].error = None
+    expire_ejection(pool, 'us-east-1')
+    assert pool.invoke_model(modelId='m', body='{}') == 'us-east-1'
+    assert region.healthy and region.eject_seconds == 5
+
+def test_unexpected_errors_release_the_region():
+    pool, clients, calls = make_pool(names=('us-east-1', 'us-west-2'))
+    clients['us-east-1'].error = throttled()
+    pool.invoke_model(modelId='m', body='{}')
+    
+    # A probe that blows up with a non-AWS error still ends the probe
+    clients['us-east-1'].error = ValueError("bad response")
+    expire_ejection(pool, 'us-east-1')
+    try:
+        pool.invoke_model(modelId='m', body='{}')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected the ValueError")
+    region = pool.regions[0]
+    assert not region.probing and region.outstanding == 0
+    assert region.eject_seconds == 10
+    
+    # ...and the region recovers on the next probe
+    clients['us-east-1'].error = None
+    expire_ejection(pool, 'us-east-1')
+    assert pool.invoke_model(modelId='m', body='{}') == 'us-east-1'
+    assert all(status['outstanding'] == 0 for status in pool.get_status().values())
+
+def test_all_regions_failing_raises_after_trying_each():
+    pool, clients, calls = make_pool()
+    for client in clients.values():
+        client.error = throttled()
+    try:
+        pool.invoke_model(modelId='m', body='{}')
+    except ClientError:
+        pass
+    else:
+        raise AssertionError("expected the throttling error")
+    assert sum(calls.values()) == 3
+
+def test_no_failover_after_deadline():
+    pool, clients, calls = make_pool()
+    for client in clients.values():
+        client.error = throttled()
+    try:
+        pool.invoke_model(deadline=0.0, modelId='m', body='{}')
+    except ClientError:
+        pass
+    assert sum(calls.values()) == 1
+    
+    # Nor when the time left can't fit a full call
+    try:
+        pool.invoke_model(deadline=time.monotonic() + 60, call_timeout=120, modelId='m', body='{}')
+    except ClientError:
+        pass
+    assert sum(calls.values()) == 2
+
+if __name__ == "__main__":
+    test_requests_spread_by_weight()
+    test_zero_weight_drains_region_and_negative_is_rejected()
+    test_throttled_region_is_ejected_and_request_fails_over()
+    test_request_errors_neither_eject_nor_fail_over()
+    test_probe_restores_region_or_backs_off()
+    test_unexpected_errors_release_the_region()
+    test_all_regions_failing_raises_after_trying_each()
+    test_no_failover_after_deadline()